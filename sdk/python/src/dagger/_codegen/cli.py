@@ -46,14 +46,15 @@ def main():
 
 
 async def codegen(output: anyio.Path | None, introspection: anyio.Path | None):
-    code = generator.generate(await _get_schema(introspection))
+    schema = await _get_schema(introspection)
 
     if output:
-        await output.write_text(code)
+        await output.write_text(generator.generate(schema))
         await _update_gitattributes(output)
         sys.stdout.write(f"Client generated successfully to {output}\n")
     else:
-        sys.stdout.write(f"{code}\n")
+        generator.generate_to(schema, sys.stdout)
+        sys.stdout.write("\n")
 
 
 async def _get_schema(path: anyio.Path | None) -> graphql.GraphQLSchema:
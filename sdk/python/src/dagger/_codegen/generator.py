@@ -1,23 +1,23 @@
 import enum
 import functools
+import io
 import itertools
 import logging
 import re
 import textwrap
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import InitVar, dataclass, field
 from datetime import date, datetime, time
 from decimal import Decimal
-from functools import partial
-from itertools import chain, groupby
+from itertools import chain
 from keyword import iskeyword
-from operator import itemgetter
+from operator import attrgetter
 from typing import (
     ClassVar,
     Generic,
-    ParamSpec,
     Protocol,
+    TextIO,
     TypeAlias,
     TypeGuard,
     TypeVar,
@@ -61,12 +61,28 @@ DEPRECATION_RE = re.compile(r"`([a-zA-Z\d_]+)`")
 
 logger = logging.getLogger(__name__)
 
-indent = partial(textwrap.indent, prefix=" " * 4)
-wrap = textwrap.wrap
-wrap_indent = partial(wrap, initial_indent=" " * 4, subsequent_indent=" " * 4)
 
+def indent(s: str) -> str:
+    """Indent non-blank lines with four spaces.
+
+    Same as :py:func:`textwrap.indent` with a fixed prefix but faster,
+    especially for the common case of single lines.
+    """
+    lines = s.splitlines(keepends=True)
+    if len(lines) == 1:
+        return f"    {s}" if s.strip() else s
+    return "".join(f"    {line}" if line.strip() else line for line in lines)
+
+
+# Reuse wrapper instances rather than creating one for every call.
+_wrapper = textwrap.TextWrapper()
+_wrapper_indent = textwrap.TextWrapper(
+    initial_indent=" " * 4, subsequent_indent=" " * 4
+)
+wrap = _wrapper.wrap
+wrap_indent = _wrapper_indent.wrap
+fill = _wrapper.fill
 
-T_ParamSpec = ParamSpec("T_ParamSpec")
 
 # These alias types are used to make the code more self-documenting.
 IDName: TypeAlias = str
@@ -82,16 +98,6 @@ SimpleFieldMap: TypeAlias = dict[FieldName, "SimpleField"]
 SimpleObjectsMap: TypeAlias = dict[TypeName, SimpleFieldMap]
 
 
-def joiner(func: Callable[T_ParamSpec, Iterator[str]]) -> Callable[T_ParamSpec, str]:
-    """Join elements with a new line from an iterator."""
-
-    @functools.wraps(func)
-    def wrapper(*args: T_ParamSpec.args, **kwargs: T_ParamSpec.kwargs) -> str:
-        return "\n".join(func(*args, **kwargs))
-
-    return wrapper
-
-
 class Scalars(enum.Enum):
     ID = str
     Int = int
@@ -105,10 +111,13 @@ class Scalars(enum.Enum):
 
     @classmethod
     def from_type(cls, t: GraphQLScalarType) -> str:
-        try:
-            return cls[t.name].value.__name__
-        except KeyError:
-            return t.name
+        return _SCALAR_NAMES.get(t.name, t.name)
+
+
+_SCALAR_NAMES: dict[TypeName, str] = {
+    name: member.value.__name__ for name, member in Scalars.__members__.items()
+}
+"""Python type names for built-in scalars, including aliases."""
 
 
 @dataclass
@@ -130,7 +139,7 @@ class Context:
     remaining: set[str] = field(default_factory=set)
     """Remaining type names that haven't been defined yet."""
 
-    def process_type(self, name: str):
+    def process_type(self, name: str) -> None:
         # This is only needed to keep track of remaining types because
         # of forward references.
         self.remaining.remove(name)
@@ -158,38 +167,49 @@ class Handler(ABC, Generic[_H]):
     def type_name(self, t: _H) -> str:
         return t.name
 
-    @joiner
-    def render(self, t: _H) -> Iterator[str]:
-        yield ""
-        yield self.render_head(t)
-        yield indent(self.render_body(t))
-        yield ""
+    def render(self, t: _H) -> str:
+        return "\n".join(("", self.render_head(t), indent(self.render_body(t)), ""))
 
     def render_head(self, t: _H) -> str:
         return f"class {self.type_name(t)}({self.supertype_name(t)}):"
 
-    @joiner
-    def render_body(self, t: _H) -> Iterator[str]:
-        if t.description:
-            yield from wrap(doc(t.description))
+    def render_body(self, t: _H) -> str:
+        return "\n".join(wrap(doc(t.description))) if t.description else ""
 
 
-@joiner
-def generate(schema: GraphQLSchema) -> Iterator[str]:
+def generate(schema: GraphQLSchema) -> str:
     """Code generation main function."""
-    yield textwrap.dedent(
-        """\
-        # Code generated by dagger. DO NOT EDIT.
-
-        import warnings
-        from collections.abc import Callable, Sequence
-        from dataclasses import dataclass
-        from typing import Optional
-
-        from ._core import Arg, Root
-        from ._guards import typecheck
-        from .base import Enum, Input, Scalar, Type
-        """,
+    buf = io.StringIO()
+    generate_to(schema, buf)
+    return buf.getvalue()
+
+
+def generate_to(schema: GraphQLSchema, out: TextIO) -> None:
+    """Write generated code to a text stream.
+
+    Each type is written as soon as it's rendered, to avoid holding
+    the whole output in memory.
+    """
+
+    def _write(s: str) -> None:
+        out.write("\n")
+        out.write(s)
+
+    out.write(
+        textwrap.dedent(
+            """\
+            # Code generated by dagger. DO NOT EDIT.
+
+            import warnings
+            from collections.abc import Callable, Sequence
+            from dataclasses import dataclass
+            from typing import Optional
+
+            from ._core import Arg, Root
+            from ._guards import typecheck
+            from .base import Enum, Input, Scalar, Type
+            """,
+        )
     )
 
     # Pre-create handy maps to make handler code simpler.
@@ -218,18 +238,21 @@ def generate(schema: GraphQLSchema) -> Iterator[str]:
     ctx.remaining.update(name for _, name, _ in types_n)
 
     for handler, type_name, named_type in types_g:
-        yield handler.render(named_type)
+        _write(handler.render(named_type))
         ctx.process_type(type_name)
 
-    yield render_default_client(
-        ctx.defined,
-        get_root_fields(schema.type_map),
+    _write(
+        render_default_client(
+            ctx.defined,
+            get_root_fields(schema.type_map),
+        )
     )
 
-    yield ""
-    yield "__all__ = ["
-    yield from (indent(f"{quote(name)},") for name in sorted(ctx.defined))
-    yield "]"
+    _write("")
+    _write("__all__ = [")
+    for name in sorted(ctx.defined):
+        _write(indent(f"{quote(name)},"))
+    _write("]")
 
 
 def create_id_map(type_map: TypeMap) -> IDMap:
@@ -237,18 +260,13 @@ def create_id_map(type_map: TypeMap) -> IDMap:
 
     Used to replace custom scalars by objects in inputs.
     """
-
-    def _iter():
-        for type_name, t in type_map.items():
-            if not is_object_type(t):
-                continue
-            fields: dict[str, GraphQLField] = t.fields
-            for field_name, f in fields.items():
-                if field_name == "id":
-                    field_type = get_named_type(f.type)
-                    yield field_type.name, type_name
-
-    return dict(_iter())
+    id_map: IDMap = {}
+    for type_name, t in type_map.items():
+        if not is_object_type(t):
+            continue
+        if f := t.fields.get("id"):
+            id_map[_unwrap(f.type).name] = type_name
+    return id_map
 
 
 def create_id_query_map(id_map: IDMap, type_map: TypeMap) -> IDQueryMap:
@@ -265,23 +283,21 @@ def create_id_query_map(id_map: IDMap, type_map: TypeMap) -> IDQueryMap:
     Used to create a classmethod that returns a Directory instance
     from a DirectoryID by telling us which field to query for.
     """
-
-    def _iter():
-        for field_name, f in get_root_fields(type_map).items():
-            field_type = get_named_type(f.type)
-            id_arg = f.args.get("id")
-            # Ignore fields that have required arguments other than id.
-            if not id_arg or any(
-                is_required_argument(arg)
-                for arg_name, arg in f.args.items()
-                if arg_name != "id"
-            ):
-                continue
-            id_type = get_named_type(id_arg.type)
-            if id_map.get(id_type.name) == field_type.name:
-                yield id_type.name, field_name
-
-    return dict(_iter())
+    id_query_map: IDQueryMap = {}
+    for field_name, f in get_root_fields(type_map).items():
+        field_type = _unwrap(f.type)
+        id_arg = f.args.get("id")
+        # Ignore fields that have required arguments other than id.
+        if not id_arg or any(
+            is_required_argument(arg)
+            for arg_name, arg in f.args.items()
+            if arg_name != "id"
+        ):
+            continue
+        id_type = _unwrap(id_arg.type)
+        if id_map.get(id_type.name) == field_type.name:
+            id_query_map[id_type.name] = field_name
+    return id_query_map
 
 
 def get_root_fields(type_map: TypeMap) -> GraphQLFieldMap:
@@ -289,25 +305,25 @@ def get_root_fields(type_map: TypeMap) -> GraphQLFieldMap:
     return cast(GraphQLObjectType, type_map["Query"]).fields
 
 
-@joiner
-def render_default_client(
-    defined: set[str], root_fields: GraphQLFieldMap
-) -> Iterator[str]:
+def render_default_client(defined: set[str], root_fields: GraphQLFieldMap) -> str:
     names = sorted(format_name(name) for name in root_fields)
 
-    yield "_client = Client()"
-    yield from (f"{name} = _client.{name}" for name in names)
+    parts = ["_client = Client()"]
+    parts.extend(f"{name} = _client.{name}" for name in names)
     defined.update(names)
 
-    yield textwrap.dedent(
+    default_client = textwrap.dedent(
         '''\
         def default_client() -> Client:
             """Return the default client instance."""
             return _client
         '''
     )
+    parts.append(default_client)
     defined.add("default_client")
 
+    return "\n".join(parts)
+
 
 @dataclass(slots=True)
 class SimpleField:
@@ -346,7 +362,7 @@ def create_simple_objects_map(type_map: TypeMap) -> SimpleObjectsMap:
     index in the list to get the result from?).
     """
 
-    def _leaf_fields(named_type: GraphQLNamedType):
+    def _leaf_fields(named_type: GraphQLNamedType) -> Iterator[tuple[str, SimpleField]]:
         # Assertion for type checker. Already guaranteed by get_lists_of_object_types
         object_type = assert_object_type(named_type)
         for f_name, f in object_type.fields.items():
@@ -363,7 +379,7 @@ def create_simple_objects_map(type_map: TypeMap) -> SimpleObjectsMap:
     }
 
 
-def get_lists_of_object_types(type_map: TypeMap):
+def get_lists_of_object_types(type_map: TypeMap) -> Iterator[GraphQLNamedType]:
     """Get object types that are returned in lists."""
     for t in type_map.values():
         if t.name.startswith("_") or not is_object_type(t):
@@ -373,25 +389,37 @@ def get_lists_of_object_types(type_map: TypeMap):
                 yield get_named_type(f.type)
 
 
-def get_grouped_types(handlers: tuple[Handler, ...], type_map: TypeMap):
+def get_grouped_types(
+    handlers: tuple[Handler, ...], type_map: TypeMap
+) -> Iterator[tuple[Handler, TypeName, GraphQLNamedType]]:
     """Group types by handler and sorted by their name."""
+    buckets: list[list[str]] = [[] for _ in handlers]
+    for n, t in type_map.items():
+        if n.startswith("_") or is_builtin_scalar_type(t):
+            continue
+        for handler, bucket in zip(handlers, buckets, strict=True):
+            if handler.predicate(t):
+                bucket.append(n)
+                break
 
-    def _filtered():
-        for n, t in type_map.items():
-            if n.startswith("_") or is_builtin_scalar_type(t):
-                continue
-            for i, handler in enumerate(handlers):
-                if handler.predicate(t):
-                    yield i, n
-
-    for _, items in groupby(sorted(_filtered()), itemgetter(0)):
-        for index, name in items:
+    for handler, bucket in zip(handlers, buckets, strict=True):
+        for name in sorted(bucket):
             named_type = type_map[name]
-            handler = handlers[index]
             formatted_name = handler.type_name(named_type)
             yield handler, formatted_name, named_type
 
 
+def _unwrap(t: GraphQLType) -> GraphQLNamedType:
+    """Strip all wrapping (e.g., List, NonNull) from a type.
+
+    Same as :py:func:`graphql.get_named_type` but without the extra
+    function calls per wrapping level.
+    """
+    while isinstance(t, GraphQLWrappingType):
+        t = t.of_type
+    return cast(GraphQLNamedType, t)
+
+
 # TODO: these typeguards should be contributed upstream
 #        https://github.com/graphql-python/graphql-core/issues/183
 
@@ -412,10 +440,6 @@ def is_list_of_objects_type(
     return is_list_type(t) and is_object_type(get_named_type(t))
 
 
-def is_wrapping_type(t: GraphQLType) -> TypeGuard[GraphQLWrappingType]:
-    return isinstance(t, GraphQLWrappingType)
-
-
 def is_scalar_type(t: GraphQLType) -> TypeGuard[GraphQLScalarType]:
     return isinstance(t, GraphQLScalarType)
 
@@ -429,12 +453,12 @@ def is_object_type(t: GraphQLType) -> TypeGuard[GraphQLObjectType]:
 
 
 def is_output_leaf_type(t: GraphQLOutputType) -> TypeGuard[GraphQLLeafType]:
-    return is_leaf_type(get_named_type(t))
+    return is_leaf_type(_unwrap(t))
 
 
 def is_custom_scalar_type(t: GraphQLType) -> TypeGuard[GraphQLScalarType]:
-    t = get_named_type(t)
-    return is_scalar_type(t) and t.name not in Scalars.__members__
+    t = _unwrap(t)
+    return is_scalar_type(t) and t.name not in _SCALAR_NAMES
 
 
 def is_builtin_scalar_type(t: GraphQLNamedType) -> TypeGuard[GraphQLScalarType]:
@@ -457,8 +481,13 @@ def is_self_chainable(t: GraphQLObjectType) -> bool:
     )
 
 
+@functools.cache
 def format_name(s: str) -> str:
     """Format a GraphQL field or argument name into Python."""
+    # Without an uppercase letter the steps below are no-ops: title-casing
+    # digits doesn't change them and words are only split before capitals.
+    if not any(c.isupper() for c in s):
+        return f"{s}_" if iskeyword(s) else s
     # rewrite acronyms, initialisms and abbreviations
     s = ACRONYM_RE.sub(lambda m: m.group(0).title(), s)
     s = camel_to_snake(s)
@@ -494,11 +523,7 @@ def format_output_type(t: GraphQLOutputType) -> str:
 
 
 def output_type_description(t: GraphQLOutputType) -> str:
-    if is_wrapping_type(t):
-        return output_type_description(t.of_type)
-    if isinstance(t, GraphQLNamedType) and t.description:
-        return t.description
-    return ""
+    return _unwrap(t).description or ""
 
 
 def doc(s: str) -> str:
@@ -552,47 +577,47 @@ class _InputField:
             self.default_value = None
             self.has_default = True
 
-    @joiner
-    def __str__(self) -> Iterator[str]:
-        """Output for an InputObject field."""
-        yield ""
+        # repr uses single quotes for strings, contrary to black
+        self.default_repr = (
+            repr(self.default_value).replace("'", '"') if self.has_default else None
+        )
+        # broaden list types to Sequence on field inputs
+        self.param_type = self.type.replace("list[", "Sequence[")
+        self.param_format = f"{self.name}: {self.param_type}"
+        if self.default_repr is not None:
+            self.param_format = f"{self.param_format} = {self.default_repr}"
+
+        params = [quote(name), self.name]
+        if self.default_repr is not None:
+            params.append(self.default_repr)
+        self.arg_format = f"Arg({', '.join(params)}),"
 
+    def __str__(self) -> str:
+        """Output for an InputObject field."""
         field = self.as_param()
         # Add quotes around types that haven't been defined yet (forward references).
         if self.ctx.remaining:
             field = re.sub(rf"\b({'|'.join(self.ctx.remaining)})\b", r'"\1"', field)
-        yield field
 
         if self.description:
-            yield doc(self.description)
+            return f"\n{field}\n{doc(self.description)}"
+        return f"\n{field}"
 
     def as_param(self) -> str:
         """As a parameter in a function signature."""
-        # broaden list types to Sequence on field inputs
-        typ = re.sub(r"list\[", "Sequence[", self.type)
-        out = f"{self.name}: {typ}"
-        if self.has_default:
-            # repr uses single quotes for strings, contrary to black
-            val = repr(self.default_value).replace("'", '"')
-            out = f"{out} = {val}"
-        return out
+        return self.param_format
 
-    @joiner
-    def as_doc(self) -> Iterator[str]:
+    def as_doc(self) -> str:
         """As a part of a docstring."""
-        yield f"{self.name}:"
+        parts = [f"{self.name}:"]
         if self.description:
             for line in self.description.split("\n"):
-                yield from wrap_indent(line)
+                parts.extend(wrap_indent(line))
+        return "\n".join(parts)
 
     def as_arg(self) -> str:
         """As a Arg object for the query builder."""
-        params = [quote(self.graphql_name), self.name]
-        comment = ""
-        if self.has_default:
-            # repr uses single quotes for strings, contrary to black
-            params.append(repr(self.default_value).replace("'", '"'))
-        return f"Arg({', '.join(params)}),{comment}"
+        return self.arg_format
 
 
 class _ObjectField:
@@ -612,12 +637,13 @@ class _ObjectField:
         self.name = format_name(name)
         self.named_type = get_named_type(field.type)
 
-        self.required_args = []
-        self.default_args = []
+        self.required_args: list[_InputField] = []
+        self.default_args: list[_InputField] = []
         for args in field.args.items():
             arg = _InputField(ctx, *args, parent=self)
             (self.default_args if arg.has_default else self.required_args).append(arg)
         self.args = self.required_args + self.default_args
+        self.has_args_doc = any(arg.description for arg in self.args)
         self.description = field.description
 
         self.is_custom_scalar = is_custom_scalar_type(field.type)
@@ -628,7 +654,7 @@ class _ObjectField:
 
         # If this field returns a list of objects, get the type's fields
         # for pre-selection.
-        self.sub_select_slots = ()
+        self.sub_select_slots: tuple[SimpleField, ...] = ()
         if is_list_of_objects_type(field.type):
             self.is_exec = True
             self.sub_select_slots = tuple(
@@ -659,48 +685,66 @@ class _ObjectField:
 
         self.id_query_field = self.ctx.id_query_map.get(self.named_type.name)
 
-    @joiner
-    def __str__(self) -> Iterator[str]:
-        yield from (
+        # The query building part of the body only depends on the above,
+        # so format it once.
+        self.args_block = self.func_args()
+        self.select_line = f'_ctx = self._select("{name}", _args)'
+        self.return_block = self.func_return()
+
+        # Fields are created while rendering their parent type, so the
+        # forward references in ctx.remaining won't change until then.
+        self.rendered = self.render()
+
+    def __str__(self) -> str:
+        return self.rendered
+
+    def render(self) -> str:
+        parts = [
             "",
             "@typecheck",
             self.func_signature(),
             indent(self.func_body()),
-        )
+        ]
 
         # convenience to await any object that has a sync method
         # without having to call it explicitly
         if self.is_leaf and self.name == "sync":
-            yield from (
-                "",
-                "def __await__(self):",
-                indent("return self.sync().__await__()"),
+            parts.extend(
+                (
+                    "",
+                    "def __await__(self):",
+                    indent("return self.sync().__await__()"),
+                )
             )
 
         if self.name == "id":
-            yield from (
-                "",
-                "@classmethod",
-                "def _id_type(cls) -> type[Scalar]:",
-                indent(f"return {self.type}"),
-            )
-            if self.id_query_field:
-                yield from (
+            parts.extend(
+                (
                     "",
                     "@classmethod",
-                    "def _from_id_query_field(cls):",
-                    indent(f'return "{self.id_query_field}"'),
+                    "def _id_type(cls) -> type[Scalar]:",
+                    indent(f"return {self.type}"),
+                )
+            )
+            if self.id_query_field:
+                parts.extend(
+                    (
+                        "",
+                        "@classmethod",
+                        "def _from_id_query_field(cls):",
+                        indent(f'return "{self.id_query_field}"'),
+                    )
                 )
 
+        return "\n".join(parts)
+
     def func_signature(self) -> str:
-        params = ", ".join(
-            chain(
-                ("self",),
-                (a.as_param() for a in self.required_args),
-                ("*",) if self.default_args else (),
-                (a.as_param() for a in self.default_args),
-            )
-        )
+        params_list = ["self"]
+        params_list.extend(a.param_format for a in self.required_args)
+        if self.default_args:
+            params_list.append("*")
+            params_list.extend(a.param_format for a in self.default_args)
+        params = ", ".join(params_list)
         # arbitrary heuristic to force trailing comma in long signatures
         if len(params) > 40:  # noqa: PLR2004
             params = f"{params},"
@@ -712,16 +756,17 @@ class _ObjectField:
             sig = re.sub(rf"\b({'|'.join(self.ctx.remaining)})\b", r'"\1"', sig)
         return sig
 
-    @joiner
-    def func_body(self) -> Iterator[str]:
+    def func_body(self) -> str:
+        parts: list[str] = []
+
         if docstring := self.func_doc():
-            yield doc(docstring)
+            parts.append(doc(docstring))
 
         if deprecated := self.deprecated():
             msg = f'Method "{self.name}" is deprecated: {deprecated}'.replace(
                 '"', '\\"'
             )
-            yield textwrap.dedent(
+            warn = textwrap.dedent(
                 f"""\
                 warnings.warn(
                     "{msg}",
@@ -730,45 +775,51 @@ class _ObjectField:
                 )\
                 """
             )
+            parts.append(warn)
 
         if self.slot_field:
-            yield f'if hasattr(self, "{self.slot_field.python_name}"):'
-            yield indent(f"return self.{self.slot_field.python_name}")
+            parts.append(f'if hasattr(self, "{self.slot_field.python_name}"):')
+            parts.append(indent(f"return self.{self.slot_field.python_name}"))
 
+        parts.append(self.args_block)
+        parts.append(self.select_line)
+        parts.append(self.return_block)
+
+        return "\n".join(parts)
+
+    def func_args(self) -> str:
         if not self.args:
-            yield "_args: list[Arg] = []"
-        else:
-            yield "_args = ["
-            yield from (indent(arg.as_arg()) for arg in self.args)
-            yield "]"
+            return "_args: list[Arg] = []"
+        args = "\n".join(indent(arg.as_arg()) for arg in self.args)
+        return f"_args = [\n{args}\n]"
 
-        yield f'_ctx = self._select("{self.graphql_name}", _args)'
+    def func_return(self) -> str:
+        if not self.is_exec:
+            return f"return {self.type}(_ctx)"
 
-        if self.is_exec:
-            if self.convert_id:
-                if _field := self.id_query_field:
-                    yield f"_id = await _ctx.execute({self.named_type.name})"
-                    yield (
+        if self.convert_id:
+            if _field := self.id_query_field:
+                return "\n".join(
+                    (
+                        f"_id = await _ctx.execute({self.named_type.name})",
                         f'_ctx = Client.from_context(_ctx)._select("{_field}",'
-                        ' [Arg("id", _id)])'
+                        ' [Arg("id", _id)])',
+                        f"return {self.type}(_ctx)",
                     )
-                    yield f"return {self.type}(_ctx)"
-                else:
-                    yield "await _ctx.execute()"
-                    yield "return self"
-            else:
-                if slots := self.sub_select_slots:
-                    target = self.named_type.name
-                    kwargs = ", ".join(s.as_kwarg() for s in slots)
-                    yield f"_ctx = {target}(_ctx)._select_multiple({kwargs},)"
-                yield f"return await _ctx.execute({self.type})"
-        else:
-            yield f"return {self.type}(_ctx)"
+                )
+            return "await _ctx.execute()\nreturn self"
+
+        out = f"return await _ctx.execute({self.type})"
+        if slots := self.sub_select_slots:
+            target = self.named_type.name
+            kwargs = ", ".join(s.as_kwarg() for s in slots)
+            out = f"_ctx = {target}(_ctx)._select_multiple({kwargs},)\n{out}"
+        return out
 
     def func_doc(self) -> str:
-        def _out():
+        def _out() -> Iterator[Iterable[str]]:
             if self.description:
-                yield (textwrap.fill(line) for line in self.description.splitlines())
+                yield (fill(line) for line in self.description.splitlines())
 
             if deprecated := self.deprecated(":py:meth:`", "`"):
                 yield chain(
@@ -783,7 +834,7 @@ class _ObjectField:
                     "This is lazyly evaluated, no operation is actually run.",
                 )
 
-            if any(arg.description for arg in self.args):
+            if self.has_args_doc:
                 yield chain(
                     (
                         "Parameters",
@@ -822,16 +873,19 @@ class _ObjectField:
 
         return "\n\n".join("\n".join(section) for section in _out())
 
-    def deprecated(self, prefix='"', suffix='"') -> str:
-        def _format_name(m):
+    def deprecated(self, prefix: str = '"', suffix: str = '"') -> str:
+        reason = self.graphql.deprecation_reason
+        if not reason:
+            return ""
+        # no references to replace
+        if "`" not in reason:
+            return reason
+
+        def _format_name(m: re.Match[str]) -> str:
             name = format_name(m.group().strip("`"))
             return f"{prefix}{name}{suffix}"
 
-        return (
-            DEPRECATION_RE.sub(_format_name, reason)
-            if (reason := self.graphql.deprecation_reason)
-            else ""
-        )
+        return DEPRECATION_RE.sub(_format_name, reason)
 
 
 @dataclass
@@ -846,20 +900,23 @@ class Scalar(Handler[GraphQLScalarType]):
 class Enum(Handler[GraphQLEnumType]):
     predicate: ClassVar[Predicate] = staticmethod(is_enum_type)
 
-    @joiner
-    def render_body(self, t: GraphQLEnumType) -> Iterator[str]:
+    def render_body(self, t: GraphQLEnumType) -> str:
+        parts: list[str] = []
+
         if body := super().render_body(t):
-            yield body
+            parts.append(body)
 
         for name, value in sorted(t.values.items()):
-            yield ""
+            parts.append("")
 
             # repr uses single quotes for strings, contrary to black
             val = repr(value.value).replace("'", '"')
-            yield f"{name} = {val}"
+            parts.append(f"{name} = {val}")
 
             if value.description:
-                yield doc(value.description)
+                parts.append(doc(value.description))
+
+        return "\n".join(parts)
 
 
 class Field(Protocol):
@@ -878,29 +935,33 @@ _F: TypeAlias = _InputField | _ObjectField
 
 class ObjectHandler(Handler[_O]):
     @abstractmethod
-    def fields(self, t: _O) -> Iterator[_F]:
+    def fields(self, t: _O) -> Iterable[_F]:
         ...
 
-    @joiner
-    def render_body(self, t: _O) -> Iterator[str]:
+    def render_body(self, t: _O) -> str:
+        parts: list[str] = []
+
         if body := super().render_body(t):
-            yield body
+            parts.append(body)
 
         if slots := self.ctx.simple_objects_map.get(t.name):
-            yield ""
-            yield f"__slots__ = ({', '.join(quote(str(s)) for s in slots.values())},)"
-            yield ""
-            yield from (s.as_attr() for s in slots.values())
-
-        yield from (
-            str(field)
-            # Sorting by graphql name rather than python name for
-            # consistency with other SDKs.
-            for field in sorted(
-                self.fields(t),
-                key=lambda f: (getattr(f, "has_default", False), f.graphql_name),
+            parts.append("")
+            parts.append(
+                f"__slots__ = ({', '.join(quote(str(s)) for s in slots.values())},)"
             )
-        )
+            parts.append("")
+            parts.extend(s.as_attr() for s in slots.values())
+
+        # Sorting by graphql name rather than python name for
+        # consistency with other SDKs, with defaulted fields last.
+        required: list[_F] = []
+        defaulted: list[_F] = []
+        for f in sorted(self.fields(t), key=attrgetter("graphql_name")):
+            (defaulted if getattr(f, "has_default", False) else required).append(f)
+        parts.extend(str(f) for f in required)
+        parts.extend(str(f) for f in defaulted)
+
+        return "\n".join(parts)
 
 
 class Input(ObjectHandler[GraphQLInputObjectType]):
@@ -909,11 +970,10 @@ class Input(ObjectHandler[GraphQLInputObjectType]):
     def render_head(self, t: GraphQLInputObjectType) -> str:
         return f"@dataclass(slots=True)\n{super().render_head(t)}"
 
-    def fields(self, t: GraphQLInputObjectType) -> Iterator[_InputField]:
-        return (
-            _InputField(self.ctx, *args)
-            for args in cast(GraphQLInputFieldMap, t.fields).items()
-        )
+    def fields(self, t: GraphQLInputObjectType) -> list[_InputField]:
+        ctx = self.ctx
+        fields = cast(GraphQLInputFieldMap, t.fields)
+        return [_InputField(ctx, name, f) for name, f in fields.items()]
 
 
 class Object(ObjectHandler[GraphQLObjectType]):
@@ -925,19 +985,17 @@ class Object(ObjectHandler[GraphQLObjectType]):
     def type_name(self, t: GraphQLObjectType) -> str:
         return super().type_name(t).replace("Query", "Client")
 
-    def fields(self, t: GraphQLObjectType) -> Iterator[_ObjectField]:
-        return (
-            _ObjectField(self.ctx, *args, t)
-            for args in cast(GraphQLFieldMap, t.fields).items()
-        )
+    def fields(self, t: GraphQLObjectType) -> list[_ObjectField]:
+        ctx = self.ctx
+        fields = cast(GraphQLFieldMap, t.fields)
+        return [_ObjectField(ctx, name, f, t) for name, f in fields.items()]
 
-    @joiner
-    def render_body(self, t: GraphQLObjectType) -> Iterator[str]:
-        yield super().render_body(t)
+    def render_body(self, t: GraphQLObjectType) -> str:
+        body = super().render_body(t)
 
         if is_self_chainable(t):
             self_name = self.type_name(t)
-            yield textwrap.dedent(
+            with_ = textwrap.dedent(
                 f'''
                 def with_(self, cb: Callable[["{self_name}"], "{self_name}"]) -> "{self_name}":
                     """Call the provided callable with current {self_name}.
@@ -947,3 +1005,6 @@ class Object(ObjectHandler[GraphQLObjectType]):
                     return cb(self)
                 '''  # noqa: E501
             )
+            body = f"{body}\n{with_}"
+
+        return body
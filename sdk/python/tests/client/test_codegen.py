@@ -1,8 +1,10 @@
+import io
 from textwrap import dedent
+from textwrap import indent as textwrap_indent
 
 import pytest
 from graphql import GraphQLArgument as Argument
-from graphql import GraphQLEnumType, GraphQLEnumValue, GraphQLID
+from graphql import GraphQLEnumType, GraphQLEnumValue, GraphQLID, GraphQLSchema
 from graphql import GraphQLField as Field
 from graphql import GraphQLInputField as Input
 from graphql import GraphQLInputField as InputField
@@ -20,6 +22,9 @@ from dagger._codegen.generator import (
     format_input_type,
     format_name,
     format_output_type,
+    generate,
+    generate_to,
+    indent,
 )
 from dagger._codegen.generator import Enum as EnumHandler
 from dagger._codegen.generator import Scalar as ScalarHandler
@@ -50,12 +55,32 @@ def ctx():
         ("from", "from_"),  # reserved keyword
         ("type", "type"),  # builtin
         ("withFS", "with_fs"),  # initialism
+        ("HTTPResponse", "http_response"),  # leading initialism
+        ("sha256Sum", "sha256_sum"),  # digits
+        ("E2ETest", "e2e_test"),  # digit in initialism
+        ("H2OLevel", "h2o_level"),  # digit in initialism
     ],
 )
 def test_format_name(graphql, expected):
     assert format_name(graphql) == expected
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "line",
+        "one\n\ntwo\n",
+        "  \nspaces",
+        "a\rb",
+        "a\r\nb",
+        "a\x0cb\u2028c",
+    ],
+)
+def test_indent(text):
+    assert indent(text) == textwrap_indent(text, " " * 4)
+
+
 opts = InputObject(
     "Options",
     fields={
@@ -270,3 +295,24 @@ def test_scalar_render(type_, expected, ctx: Context):
 def test_enum_render(type_, expected, ctx: Context):
     handler = EnumHandler(ctx)
     assert handler.render(type_) == expected
+
+
+def test_generate_to():
+    schema = GraphQLSchema(
+        Object(
+            "Query",
+            fields={
+                "cacheVolume": Field(
+                    NonNull(cache_volume),
+                    {"key": Argument(NonNull(String))},
+                ),
+            },
+        ),
+    )
+    out = io.StringIO()
+    generate_to(schema, out)
+    code = out.getvalue()
+    assert code == generate(schema)
+    assert code.startswith("# Code generated by dagger. DO NOT EDIT.\n")
+    assert "\n\nclass CacheVolume(Type):\n" in code
+    assert code.endswith('\n    "default_client",\n]')